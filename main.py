@@ -26,33 +26,37 @@ def init_status_collection():
     return user_status.UserStatusCollection(db)
 
 
+def _read_csv_rows(filename):
+    """
+    Yields the raw rows of a CSV file as dictionaries
+    """
+    with open(filename, encoding="utf-8", newline="") as csvfile:
+        yield from csv.DictReader(csvfile)
+
+
 def load_users(filename):
     """
     Opens a CSV file with user data and adds it to an existing instance of UserCollection
     """
     try:
-        with open(filename, encoding="utf-8", newline="") as csvfile:
-            reader = csv.DictReader(csvfile)
-            user_data = [
-                {
-                    "user_id": row["USER_ID"],
-                    "user_email": row["EMAIL"],
-                    "user_name": row["NAME"],
-                    "user_last_name": row["LASTNAME"],
-                }
-                for row in reader
-                if all(
-                    key in row and row[key]
-                    for key in ["USER_ID", "EMAIL", "NAME", "LASTNAME"]
-                )
-            ]
-            if user_data:
-                with db.atomic():  # Use transactions
-                    for batch in chunked(
-                        user_data, 100
-                    ):  # Adjust the batch size as needed
-                        UserModel.insert_many(batch).execute()
-            return True
+        user_data = [
+            {
+                "user_id": row["USER_ID"],
+                "user_email": row["EMAIL"],
+                "user_name": row["NAME"],
+                "user_last_name": row["LASTNAME"],
+            }
+            for row in _read_csv_rows(filename)
+            if all(
+                key in row and row[key]
+                for key in ["USER_ID", "EMAIL", "NAME", "LASTNAME"]
+            )
+        ]
+        if user_data:
+            with db.atomic():  # Use transactions
+                for batch in chunked(user_data, 100):  # Adjust the batch size as needed
+                    UserModel.insert_many(batch).execute()
+        return True
     except (FileNotFoundError, KeyError):
         return False
 
@@ -63,27 +67,25 @@ def load_status_updates(filename):
     or directly to the database using insert_many.
     """
     try:
-        with open(filename, encoding="utf-8", newline="") as csvfile:
-            reader = csv.DictReader(csvfile)
-            status_data = [
-                {
-                    "status_id": row["STATUS_ID"],
-                    "user_id": row["USER_ID"],
-                    "status_text": row["STATUS_TEXT"],
-                }
-                for row in reader
-                if all(
-                    key in row and row[key]
-                    for key in ["STATUS_ID", "USER_ID", "STATUS_TEXT"]
-                )
-            ]
-            if status_data:
-                with db.atomic():  # Use transactions
-                    for batch in chunked(
-                        status_data, 100
-                    ):  # Adjust the batch size as needed
-                        StatusModel.insert_many(batch).execute()
-            return True
+        status_data = [
+            {
+                "status_id": row["STATUS_ID"],
+                "user_id": row["USER_ID"],
+                "status_text": row["STATUS_TEXT"],
+            }
+            for row in _read_csv_rows(filename)
+            if all(
+                key in row and row[key]
+                for key in ["STATUS_ID", "USER_ID", "STATUS_TEXT"]
+            )
+        ]
+        if status_data:
+            with db.atomic():  # Use transactions
+                for batch in chunked(
+                    status_data, 100
+                ):  # Adjust the batch size as needed
+                    StatusModel.insert_many(batch).execute()
+        return True
     except (FileNotFoundError, KeyError):
         return False
 
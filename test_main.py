@@ -3,13 +3,90 @@ Unittests for main.py
 """
 
 import unittest
-from unittest.mock import Mock, patch, MagicMock
+from types import MappingProxyType, SimpleNamespace
+from unittest.mock import call, create_autospec, mock_open, patch, MagicMock
 
 from peewee import SqliteDatabase
 
 import main
+import users
+import user_status
 from socialnetwork_model import StatusModel
-from user_status import UserStatusCollection
+
+_USER_COLL_SPEC = create_autospec(users.UserCollection, instance=True)
+_STATUS_COLL_SPEC = create_autospec(user_status.UserStatusCollection, instance=True)
+
+_USER_ROWS = (
+    MappingProxyType(
+        {
+            "USER_ID": "Test",
+            "EMAIL": "test@uw.edu",
+            "NAME": "Test",
+            "LASTNAME": "Test",
+        }
+    ),
+    MappingProxyType(
+        {
+            "USER_ID": "SF",
+            "EMAIL": "safe@uw.edu",
+            "NAME": "Sabrina",
+            "LASTNAME": "Fechtner",
+        }
+    ),
+)
+
+_STATUS_ROWS = (
+    MappingProxyType({"STATUS_ID": "SF1", "USER_ID": "SF", "STATUS_TEXT": "Hello"}),
+    MappingProxyType({"STATUS_ID": "SF2", "USER_ID": "SF", "STATUS_TEXT": "World!"}),
+)
+
+# (main function, collection method, main args, forwarded args)
+_USER_OPS = (
+    (
+        "add_user",
+        "add_user",
+        ("SC", "sesame@uw.edu", "Sesame", "Chan"),
+        ("SC", "sesame@uw.edu", "Sesame", "Chan"),
+    ),
+    (
+        "update_user",
+        "modify_user",
+        ("SC", "newemail@uw.edu", "Sesame", "Chan"),
+        ("SC", "newemail@uw.edu", "Sesame", "Chan"),
+    ),
+    ("delete_user", "delete_user", ("SF",), ("SF",)),
+)
+
+_STATUS_OPS = (
+    (
+        "add_status",
+        "add_status",
+        ("SF", "status1", "Hello World!"),
+        ("status1", "SF", "Hello World!"),
+    ),
+    (
+        "update_status",
+        "modify_status",
+        ("status1", "SF", "Updated Status!"),
+        ("status1", "SF", "Updated Status!"),
+    ),
+    ("delete_status", "delete_status", ("status1",), ("status1",)),
+)
+
+_EXPECTED_USER_ROWS = [
+    {
+        "user_id": "Test",
+        "user_email": "test@uw.edu",
+        "user_name": "Test",
+        "user_last_name": "Test",
+    },
+    {
+        "user_id": "SF",
+        "user_email": "safe@uw.edu",
+        "user_name": "Sabrina",
+        "user_last_name": "Fechtner",
+    },
+]
 
 
 class TestMainUserFunctions(unittest.TestCase):
@@ -17,66 +94,44 @@ class TestMainUserFunctions(unittest.TestCase):
     testing class for main.py accounts functions
     """
 
+    mock_user_collection = _USER_COLL_SPEC
+
     def setUp(self):
         """
         set up for testing
         """
-        self.mock_user_collection = Mock()
+        self.mock_user_collection.reset_mock(return_value=True, side_effect=True)
 
     def test_init_user_collection(self):
         """
         test initializing user collection
         """
-        with patch("users.UserCollection") as mock_user_collection:
+        with patch.object(users, "UserCollection") as mock_user_collection:
             collection = main.init_user_collection()
             mock_user_collection.assert_called_once()
-            self.assertIsNotNone(collection)
+            self.assertIs(collection, mock_user_collection.return_value)
 
-    def test_load_users_success(self):
+    @patch("main.db.atomic", new_callable=MagicMock)
+    @patch("main.UserModel.insert_many")
+    @patch("main._read_csv_rows", return_value=_USER_ROWS)
+    def test_load_users_success(self, _mock_read_rows, mock_insert_many, _mock_atomic):
         """
         test loading users into database from csv file
         """
-        mock_dictreader = MagicMock()
-        mock_dictreader.__iter__.return_value = [
-            {
-                "USER_ID": "Test",
-                "EMAIL": "test@uw.edu",
-                "NAME": "Test",
-                "LASTNAME": "Test",
-            },
-            {
-                "USER_ID": "SF",
-                "EMAIL": "safe@uw.edu",
-                "NAME": "Sabrina",
-                "LASTNAME": "Fechtner",
-            },
-        ]
-
-        with patch("builtins.open", create=True), patch(
-            "csv.DictReader", return_value=mock_dictreader
-        ), patch("main.UserModel.insert_many") as mock_insert_many, patch(
-            "main.db.atomic", MagicMock()
-        ):
-            result = main.load_users("test.csv")
-            self.assertTrue(result)
-            mock_insert_many.assert_called_once()
-            self.assertEqual(
-                mock_insert_many.call_args[0][0],
-                [
-                    {
-                        "user_id": "Test",
-                        "user_email": "test@uw.edu",
-                        "user_name": "Test",
-                        "user_last_name": "Test",
-                    },
-                    {
-                        "user_id": "SF",
-                        "user_email": "safe@uw.edu",
-                        "user_name": "Sabrina",
-                        "user_last_name": "Fechtner",
-                    },
-                ],
-            )
+        result = main.load_users("test.csv")
+        self.assertTrue(result)
+        mock_insert_many.assert_called_once()
+        self.assertEqual(mock_insert_many.call_args[0][0], _EXPECTED_USER_ROWS)
+
+    def test_read_csv_rows(self):
+        """
+        test reading raw rows from csv text
+        """
+        csv_text = "USER_ID,EMAIL,NAME,LASTNAME\nSF,safe@uw.edu,Sabrina,Fechtner\n"
+        with patch("builtins.open", mock_open(read_data=csv_text)) as mock_file:
+            rows = list(main._read_csv_rows("test.csv"))  # pylint: disable=W0212
+        mock_file.assert_called_once_with("test.csv", encoding="utf-8", newline="")
+        self.assertEqual(rows, [dict(_USER_ROWS[1])])
 
     def test_load_users_failure(self):
         """
@@ -86,46 +141,28 @@ class TestMainUserFunctions(unittest.TestCase):
             result = main.load_users("nonexistent.csv")
             self.assertFalse(result)
 
-    def test_add_user(self):
+    def test_user_op_forwards(self):
         """
-        test adding user to database
+        test adding, updating and deleting users are forwarded to the collection
         """
-        self.mock_user_collection.add_user.return_value = True
-        result = main.add_user(
-            "SC", "sesame@uw.edu", "Sesame", "Chan", self.mock_user_collection
-        )
-        self.assertTrue(result)
-        self.mock_user_collection.add_user.assert_called_once_with(
-            "SC", "sesame@uw.edu", "Sesame", "Chan"
-        )
-
-    def test_update_user(self):
-        """
-        test updating user in database
-        """
-        self.mock_user_collection.modify_user.return_value = True
-        result = main.update_user(
-            "SC", "newemail@uw.edu", "Sesame", "Chan", self.mock_user_collection
-        )
-        self.assertTrue(result)
-        self.mock_user_collection.modify_user.assert_called_once_with(
-            "SC", "newemail@uw.edu", "Sesame", "Chan"
-        )
-
-    def test_delete_user(self):
-        """
-        test deleting user in database
-        """
-        self.mock_user_collection.delete_user.return_value = True
-        result = main.delete_user("SF", self.mock_user_collection)
-        self.assertTrue(result)
-        self.mock_user_collection.delete_user.assert_called_once_with("SF")
+        for op, method, args, expected in _USER_OPS:
+            with self.subTest(op=op):
+                self.mock_user_collection.reset_mock(
+                    return_value=True, side_effect=True
+                )
+                getattr(self.mock_user_collection, method).return_value = True
+                result = getattr(main, op)(*args, self.mock_user_collection)
+                self.assertTrue(result)
+                self.assertEqual(
+                    self.mock_user_collection.mock_calls,
+                    [getattr(call, method)(*expected)],
+                )
 
     def test_search_user(self):
         """
         test searching user in database
         """
-        user_mock = Mock(user_id="SF")
+        user_mock = SimpleNamespace(user_id="SF")
         self.mock_user_collection.search_user.return_value = user_mock
         result = main.search_user("SF", self.mock_user_collection)
         self.assertEqual(result.user_id, "SF")
@@ -136,61 +173,73 @@ class TestMainStatusFunctions(unittest.TestCase):
     testing class for main.py for status functions
     """
 
+    mock_status_collection = _STATUS_COLL_SPEC
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        create testing database in memory once for the class
+        """
+        # shared-cache URI lets every connection in this process see one schema
+        cls.database = SqliteDatabase("file:testdb?mode=memory&cache=shared", uri=True)
+        cls.database.bind([StatusModel])
+        cls.database.connect()
+        cls.database.create_tables([StatusModel])
+
+    @classmethod
+    def tearDownClass(cls):
+        """
+        tear down testing database
+        """
+        cls.database.drop_tables([StatusModel])
+        cls.database.close()
+
     def setUp(self):
         """
         set up for testing
         """
-        self.mock_status_collection = Mock()
+        self.mock_status_collection.reset_mock(return_value=True, side_effect=True)
 
     def test_init_status_collection(self):
         """
         test initializing status collection
         """
-        with patch("user_status.UserStatusCollection") as mock_status_collection:
+        with patch.object(
+            user_status, "UserStatusCollection"
+        ) as mock_status_collection:
             collection = main.init_status_collection()
             mock_status_collection.assert_called_once()
-            self.assertIsNotNone(collection)
+            self.assertIs(collection, mock_status_collection.return_value)
 
-    def test_load_status_updates_success(self):
+    # stand-in for the foreign key table
+    @patch("main.UserModel", SimpleNamespace(select=lambda: [{"user_id": "SF"}]))
+    @patch("main.StatusModel.insert_many")
+    @patch("main.db.atomic", new_callable=MagicMock)
+    @patch("main._read_csv_rows", return_value=_STATUS_ROWS)
+    def test_load_status_updates_success(
+        self, _mock_read_rows, _mock_atomic, mock_insert_many
+    ):
         """
         test loading status updates into database from csv file
         """
-        # Set up an in-memory SQLite database
-        database = SqliteDatabase(":memory:")
-        database.bind([StatusModel])
-        database.connect()
-        database.create_tables([StatusModel])
-
-        # Create an instance of UserStatusCollection with the in-memory database
-        UserStatusCollection(database)
-
-        # Mock data and setup for foreign key table
-        mock_user_model = MagicMock()
-        mock_user_model.select.return_value = [{"user_id": "SF"}]
-
-        # Mock csv.DictReader to simulate reading from CSV
-        mock_dictreader = MagicMock()
-        mock_dictreader.__iter__.return_value = [
-            {"STATUS_ID": "SF1", "USER_ID": "SF", "STATUS_TEXT": "Hello"},
-            {"STATUS_ID": "SF2", "USER_ID": "SF", "STATUS_TEXT": "World!"},
-        ]
-
-        # Mock database atomic and StatusModel insert
-        with patch("builtins.open", create=True), patch(
-            "csv.DictReader", return_value=mock_dictreader
-        ), patch("main.db.atomic"), patch(
-            "main.StatusModel.insert_many"
-        ) as mock_insert_many, patch(
-            "main.UserModel", mock_user_model
-        ):
-
-            result = main.load_status_updates("test_status.csv")
-            self.assertTrue(result)
-            self.assertEqual(mock_insert_many.call_count, 1)
+        result = main.load_status_updates("test_status.csv")
+        self.assertTrue(result)
+        self.assertEqual(mock_insert_many.call_count, 1)
 
-        # Clean up the in-memory database
-        database.drop_tables([StatusModel])
-        database.close()
+    def test_add_status_to_database(self):
+        """
+        test adding status through a collection on the in-memory database
+        """
+        status_collection = user_status.UserStatusCollection(self.database)
+        with self.database.atomic() as txn:
+            result = main.add_status("SF", "status1", "Hello World!", status_collection)
+            self.assertTrue(result)
+            self.assertEqual(
+                StatusModel.get_by_id("status1").status_text, "Hello World!"
+            )
+            # roll back so the class-wide schema is left empty for other tests
+            txn.rollback()
+        self.assertEqual(StatusModel.select().count(), 0)
 
     def test_load_status_updates_failure(self):
         """
@@ -200,46 +249,28 @@ class TestMainStatusFunctions(unittest.TestCase):
             result = main.load_status_updates("nonexistent.csv")
             self.assertFalse(result)
 
-    def test_add_status(self):
-        """
-        test adding status to database
-        """
-        self.mock_status_collection.add_status.return_value = True
-        result = main.add_status(
-            "SF", "status1", "Hello World!", self.mock_status_collection
-        )
-        self.assertTrue(result)
-        self.mock_status_collection.add_status.assert_called_once_with(
-            "status1", "SF", "Hello World!"
-        )
-
-    def test_update_status(self):
+    def test_status_op_forwards(self):
         """
-        test updating status in database
+        test adding, updating and deleting statuses are forwarded to the collection
         """
-        self.mock_status_collection.modify_status.return_value = True
-        result = main.update_status(
-            "status1", "SF", "Updated Status!", self.mock_status_collection
-        )
-        self.assertTrue(result)
-        self.mock_status_collection.modify_status.assert_called_once_with(
-            "status1", "SF", "Updated Status!"
-        )
-
-    def test_delete_status(self):
-        """
-        test deleting status in database
-        """
-        self.mock_status_collection.delete_status.return_value = True
-        result = main.delete_status("status1", self.mock_status_collection)
-        self.assertTrue(result)
-        self.mock_status_collection.delete_status.assert_called_once_with("status1")
+        for op, method, args, expected in _STATUS_OPS:
+            with self.subTest(op=op):
+                self.mock_status_collection.reset_mock(
+                    return_value=True, side_effect=True
+                )
+                getattr(self.mock_status_collection, method).return_value = True
+                result = getattr(main, op)(*args, self.mock_status_collection)
+                self.assertTrue(result)
+                self.assertEqual(
+                    self.mock_status_collection.mock_calls,
+                    [getattr(call, method)(*expected)],
+                )
 
     def test_search_status(self):
         """
         test searching status in database
         """
-        status_mock = Mock(status_id="status1")
+        status_mock = SimpleNamespace(status_id="status1")
         self.mock_status_collection.search_status.return_value = status_mock
         result = main.search_status("status1", self.mock_status_collection)
         self.assertEqual(result.status_id, "status1")